@@ -5,89 +5,327 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import httpx
+import orjson
+from selectolax.lexbor import LexborHTMLParser
 import smtplib
 import os
 from dotenv import load_dotenv
 import time
 import uuid
-import json
+import re
+import math
+import sqlite3
 from pathlib import Path
 import logging
 import datetime
+import atexit
+import functools
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter
 
 load_dotenv()
 
 SMTP = os.getenv("SMTP_ADDRESS", "smtp.gmail.com")
 SENDER_EMAIL = os.getenv("EMAIL_ADDRESS")
 SENDER_PASSWORD = os.getenv("EMAIL_PASSWORD")
+try:
+    SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+except Exception:
+    SMTP_PORT = 587
 
 DATA_DIR = Path(__file__).parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
+try:
+    TRACKER_PARALLELISM = max(1, int(os.getenv("TRACKER_PARALLELISM", "8")))
+except Exception:
+    TRACKER_PARALLELISM = 8
+
 if not SENDER_EMAIL or not SENDER_PASSWORD:
     logging.warning("EMAIL_ADDRESS or EMAIL_PASSWORD not set in .env — emails will fail until configured.")
 
 
-def get_price(url, wait_seconds=3):
-    """Return product price as float, or None if not found. Uses Selenium (headless Chrome)."""
+# Idle Chrome drivers, one per concurrent Selenium fetch at most; each thread owns its driver while in use.
+_drivers = queue.LifoQueue()
+_driver_slots = threading.BoundedSemaphore(TRACKER_PARALLELISM)
+
+
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")
+
+
+@functools.lru_cache(maxsize=None)
+def _chromedriver_path():
+    """Resolve chromedriver once per process; CHROMEDRIVER_PATH skips webdriver_manager."""
+    return CHROMEDRIVER_PATH or ChromeDriverManager().install()
+
+
+def _new_driver():
+    """Start a headless Chrome driver."""
     options = webdriver.ChromeOptions()
     options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_argument("--log-level=3")
+    # Only the price node is needed; skip images and background work.
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-timer-throttling")
+    options.add_argument("--disable-renderer-backgrounding")
+    options.add_argument("--disable-features=TranslateUI")
+    options.add_argument("--mute-audio")
+    options.add_argument("--hide-scrollbars")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        },
+    )
+    # Return from driver.get() at DOMContentLoaded; the wait below covers the price node.
+    options.page_load_strategy = "eager"
+    return webdriver.Chrome(service=Service(_chromedriver_path()), options=options)
+
+
+def _quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def _trim_idle_drivers(keep=0):
+    """Quit idle drivers until at most `keep` remain; drivers in use are not touched."""
+    idle = []
+    while True:
+        try:
+            idle.append(_drivers.get_nowait())
+        except queue.Empty:
+            break
+    for driver in idle[:keep]:
+        _drivers.put(driver)
+    for driver in idle[keep:]:
+        _quit_driver(driver)
+
+
+atexit.register(_trim_idle_drivers)
+
+
+_http = httpx.Client(
+    http2=True,
+    headers={
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+        ),
+        "Accept-Language": "en-IN,en;q=0.9",
+    },
+    timeout=10.0,
+    follow_redirects=True,
+)
+atexit.register(_http.close)
+
+HTML_PRICE_SELECTORS = (
+    ".a-price .a-offscreen",
+    "#priceblock_ourprice",
+    "#priceblock_dealprice",
+    "#price_inside_buybox",
+    ".a-price-whole",
+    "[data-a-size='l'] .a-offscreen",
+)
+
+# All price selectors as one CSS selector list, so a single WebDriver call covers them.
+COMBINED_PRICE_SELECTOR = ", ".join(HTML_PRICE_SELECTORS)
+_ANY_PRICE_PRESENT = EC.presence_of_element_located((By.CSS_SELECTOR, COMBINED_PRICE_SELECTOR))
+# Same lookup as get_price_http: first match of each selector, in priority order, first non-empty text wins.
+_PRICE_TEXT_JS = """
+for (const sel of arguments[0]) {
+    const el = document.querySelector(sel);
+    const txt = el && el.textContent.trim();
+    if (txt) return txt;
+}
+return null;
+"""
+
+_PRICE_RE = re.compile(r"[\d.]+")
+_PRICE_STRIP = str.maketrans("", "", "₹, ")
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+
+class BotCheckPage(Exception):
+    """Amazon answered with a CAPTCHA / robot check instead of the product page."""
+
+
+def get_price(url, wait_seconds=3):
+    """Return product price as float, or None if not found.
+
+    Reads the price from the raw HTML first and only starts headless Chrome
+    when Amazon serves a bot-check page.
+    """
     try:
-        driver.get(url)
-        time.sleep(wait_seconds)
-
-        selectors = [
-            (By.CSS_SELECTOR, ".a-price .a-offscreen"),
-            (By.ID, "priceblock_ourprice"),
-            (By.ID, "priceblock_dealprice"),
-            (By.ID, "price_inside_buybox"),
-            (By.CLASS_NAME, "a-price-whole"),
-        ]
-
-        price_text = None
-        for by, sel in selectors:
+        return get_price_http(url)
+    except BotCheckPage:
+        logging.info("Bot check served for %s; falling back to Selenium", url)
+    except httpx.HTTPError:
+        logging.warning("HTTP fetch failed for %s; falling back to Selenium", url)
+    return get_price_selenium(url, wait_seconds)
+
+
+# Per-host fetch and bot-check counts, logged at DEBUG so operators can see how often Chrome is needed.
+_http_fetches = Counter()
+_http_bot_checks = Counter()
+_http_stats_lock = threading.Lock()
+
+
+def _is_bot_check(tree):
+    title = tree.css_first("title")
+    if title and "Robot Check" in title.text(strip=True):
+        return True
+    return tree.css_first("form[action*='validateCaptcha']") is not None
+
+
+def _record_bot_check(host, reason):
+    with _http_stats_lock:
+        _http_bot_checks[host] += 1
+        fetches, bot_checks = _http_fetches[host], _http_bot_checks[host]
+    logging.debug("Bot check on %s (%s); %d of %d fetches", host, reason, bot_checks, fetches)
+
+
+def get_price_http(url):
+    """Return product price as float, or None if not found. Uses a plain HTTP GET."""
+    r = _http.get(url)
+    host = r.url.host
+    with _http_stats_lock:
+        _http_fetches[host] += 1
+
+    if r.status_code in (403, 503):
+        _record_bot_check(host, f"HTTP {r.status_code}")
+        raise BotCheckPage(url)
+
+    tree = LexborHTMLParser(r.text)
+    for sel in HTML_PRICE_SELECTORS:
+        node = tree.css_first(sel)
+        if node is None:
+            continue
+        txt = node.text(strip=True)
+        if txt:
+            return parse_price(txt)
+
+    # Only a page without a price is worth classifying; normal pages may mention captchas in scripts.
+    if _is_bot_check(tree):
+        _record_bot_check(host, "captcha page")
+        raise BotCheckPage(url)
+    return None
+
+
+def get_price_selenium(url, wait_seconds=3):
+    """Return product price as float, or None if not found. Uses Selenium (headless Chrome)."""
+    with _driver_slots:
+        try:
+            driver = _drivers.get_nowait()
+        except queue.Empty:
+            driver = _new_driver()
+        try:
+            price = _read_price(driver, url, wait_seconds)
+        except WebDriverException:
+            # Chrome crashed or the session expired; start over once.
+            logging.warning("WebDriver session lost; restarting Chrome and retrying %s", url)
+            _quit_driver(driver)
+            driver = _new_driver()
             try:
-                el = driver.find_element(by, sel)
-                txt = el.get_attribute("textContent") or el.text
-                txt = txt.strip()
-                if txt:
-                    price_text = txt
-                    break
+                price = _read_price(driver, url, wait_seconds)
             except Exception:
-                continue
+                _quit_driver(driver)
+                raise
+        except Exception:
+            _drivers.put(driver)
+            raise
+        _drivers.put(driver)
+        return price
+
+
+def _read_price(driver, url, wait_seconds):
+    driver.delete_all_cookies()
+    driver.get(url)
+
+    # Wait until any price node is present instead of sleeping a fixed time.
+    try:
+        WebDriverWait(driver, wait_seconds).until(_ANY_PRICE_PRESENT)
+    except TimeoutException:
+        pass
+
+    # One WebDriver round trip for all selectors.
+    price_text = driver.execute_script(_PRICE_TEXT_JS, list(HTML_PRICE_SELECTORS))
+
+    if not price_text:
+        return None
+
+    return parse_price(price_text)
+
+
+def parse_price(price_text):
+    """Turn a scraped price string like '₹1,299.00' into a float, or None."""
+    cleaned = price_text.translate(_PRICE_STRIP).replace("Rs.", "").replace("INR", "").strip()
 
-        if not price_text:
+    try:
+        price_value = float(cleaned)
+        return price_value
+    except Exception:
+        m = _PRICE_RE.findall(cleaned)
+        if m:
             try:
-                el = driver.find_element(By.CSS_SELECTOR, "[data-a-size='l'] .a-offscreen")
-                price_text = (el.get_attribute("textContent") or el.text).strip()
-            except Exception:
-                pass
+                return float(m[0])
+            except:
+                return None
+        return None
 
-        if not price_text:
-            return None
 
-        cleaned = price_text.replace("₹", "").replace("Rs.", "").replace("INR", "")
-        cleaned = cleaned.replace(",", "").replace(" ", "").strip()
+_smtp = None
+_smtp_lock = threading.Lock()
 
+
+def _close_smtp():
+    global _smtp
+    if _smtp is not None:
         try:
-            price_value = float(cleaned)
-            return price_value
+            _smtp.quit()
         except Exception:
-            import re
-            m = re.findall(r"[\d\.]+", cleaned)
-            if m:
-                try:
-                    return float(m[0])
-                except:
-                    return None
-            return None
-    finally:
-        driver.quit()
+            pass
+        _smtp = None
+
+
+def _get_smtp():
+    """Return a logged-in SMTP connection, reusing the previous one while it still answers NOOP."""
+    global _smtp
+    if _smtp is not None:
+        try:
+            if _smtp.noop()[0] == 250:
+                return _smtp
+        except Exception:
+            pass
+        _close_smtp()
+
+    if SMTP_PORT == 465:
+        connection = smtplib.SMTP_SSL(SMTP, SMTP_PORT, timeout=30)
+    else:
+        connection = smtplib.SMTP(SMTP, SMTP_PORT, timeout=30)
+    try:
+        if SMTP_PORT != 465:
+            connection.starttls()
+        connection.login(SENDER_EMAIL, SENDER_PASSWORD)
+    except Exception:
+        connection.close()
+        raise
+    _smtp = connection
+    return _smtp
+
+
+atexit.register(_close_smtp)
 
 
 def send_email(recipient_email, url, current_price, target_price):
@@ -113,75 +351,228 @@ Price Tracker Bot
         logging.error("SMTP credentials not configured; cannot send email.")
         return False
 
-    try:
-        with smtplib.SMTP(SMTP, 587) as connection:
-            connection.starttls()
-            connection.login(SENDER_EMAIL, SENDER_PASSWORD)
-            connection.sendmail(from_addr=SENDER_EMAIL, to_addrs=recipient_email, msg=message.encode("utf-8"))
-        return True
-    except Exception as e:
-        logging.exception("Failed to send email:")
+    with _smtp_lock:
+        try:
+            try:
+                _get_smtp().sendmail(from_addr=SENDER_EMAIL, to_addrs=recipient_email, msg=message.encode("utf-8"))
+            except smtplib.SMTPServerDisconnected:
+                # The server dropped the idle connection between NOOP and send; reconnect once.
+                _close_smtp()
+                _get_smtp().sendmail(from_addr=SENDER_EMAIL, to_addrs=recipient_email, msg=message.encode("utf-8"))
+            return True
+        except Exception as e:
+            logging.exception("Failed to send email:")
+            _close_smtp()
+            return False
+
+
+DB_PATH = DATA_DIR / "trackers.db"
+
+_db = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+_db.execute("PRAGMA journal_mode=WAL")
+_db.execute("PRAGMA synchronous=NORMAL")
+_db.execute(
+    "CREATE TABLE IF NOT EXISTS trackers ("
+    "id TEXT PRIMARY KEY, url TEXT, target_price REAL, email TEXT, created_at REAL)"
+)
+
+# Trackers live in memory; changed ids are written to the database by flush_trackers().
+_trackers: dict[str, dict] = {}
+_dirty: set[str] = set()
+_trackers_lock = threading.Lock()
+_flush_lock = threading.Lock()
+
+
+def _load_db_rows():
+    return {
+        tid: {"url": url, "target_price": target_price, "email": email, "created_at": created_at}
+        for tid, url, target_price, email, created_at in _db.execute(
+            "SELECT id, url, target_price, email, created_at FROM trackers"
+        )
+    }
+
+
+def _load_trackers():
+    _trackers.update(_load_db_rows())
+
+    # Trackers saved by older versions as one JSON file each; import, then drop the files.
+    legacy = []
+    for p in DATA_DIR.glob("*.json"):
+        try:
+            d = orjson.loads(p.read_bytes())
+            if not _is_valid_tracker(d):
+                logging.error("Skipping malformed tracker file %s", p)
+                continue
+            _trackers[p.stem] = d
+            _dirty.add(p.stem)
+            legacy.append(p)
+        except Exception:
+            logging.exception("Failed to import tracker file %s", p)
+    flush_trackers()
+    for p in legacy:
+        # A row that failed to insert is dropped from _dirty too, so confirm it actually landed.
+        if _db.execute("SELECT 1 FROM trackers WHERE id = ?", (p.stem,)).fetchone():
+            p.unlink()
+
+
+def _is_valid_tracker(d) -> bool:
+    """True if d is a tracker dict whose fields fit the trackers table."""
+    if not isinstance(d, dict):
         return False
+    if not isinstance(d.get("url"), str) or not isinstance(d.get("email"), str):
+        return False
+    for key in ("target_price", "created_at"):
+        value = d.get(key)
+        if value is None and key == "created_at":
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            return False
+    return True
 
 
 def save_tracker(data: dict) -> str:
-    """Save tracker dict to a JSON file, return id."""
+    """Store tracker dict in memory and mark it for the next flush, return id."""
     tid = str(uuid.uuid4())
-    path = DATA_DIR / f"{tid}.json"
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with _trackers_lock:
+        _trackers[tid] = data
+        _dirty.add(tid)
     return tid
 
 
 def load_all_trackers():
-    for p in DATA_DIR.glob("*.json"):
+    """Return a snapshot list of (id, tracker dict) pairs."""
+    with _trackers_lock:
+        return list(_trackers.items())
+
+
+def delete_tracker(tid: str):
+    with _trackers_lock:
+        _trackers.pop(tid, None)
+        _dirty.add(tid)
+
+
+def flush_trackers():
+    """Write dirty trackers to the database and delete rows of removed ones."""
+    with _flush_lock:
+        with _trackers_lock:
+            pending = [(tid, _trackers.get(tid)) for tid in _dirty]
+            _dirty.clear()
+        if not pending:
+            return
+
         try:
-            with p.open("r", encoding="utf-8") as f:
-                d = json.load(f)
-            yield p, d
+            _db.execute("BEGIN")
+            for tid, data in pending:
+                # One savepoint per row, so a row that cannot be written is dropped without losing the rest.
+                _db.execute("SAVEPOINT tracker_row")
+                try:
+                    if data is None:
+                        _db.execute("DELETE FROM trackers WHERE id = ?", (tid,))
+                    else:
+                        _db.execute(
+                            "INSERT OR REPLACE INTO trackers (id, url, target_price, email, created_at) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            (tid, data.get("url"), data.get("target_price"), data.get("email"), data.get("created_at")),
+                        )
+                except Exception:
+                    logging.exception("Dropping tracker %s from flush; it cannot be stored", tid)
+                    _db.execute("ROLLBACK TO tracker_row")
+                _db.execute("RELEASE tracker_row")
+            _db.execute("COMMIT")
         except Exception:
-            logging.exception("Failed to read tracker file %s", p)
+            logging.exception("Failed to flush %d trackers", len(pending))
+            if _db.in_transaction:
+                _db.execute("ROLLBACK")
+            with _trackers_lock:
+                _dirty.update(tid for tid, _ in pending)
 
 
-def delete_tracker_file(path: Path):
-    try:
-        path.unlink()
-    except Exception:
-        logging.exception("Failed to delete tracker file %s", path)
+def refresh_trackers():
+    """Pick up trackers that other worker processes have written to the database."""
+    with _flush_lock:
+        rows = _load_db_rows()
+    with _trackers_lock:
+        for tid, d in rows.items():
+            # A dirty id was changed or deleted here and not flushed yet; memory wins.
+            if tid not in _trackers and tid not in _dirty:
+                _trackers[tid] = d
 
 
-def check_all_trackers():
-    logging.info("Running scheduled check for %s trackers", len(list(DATA_DIR.glob("*.json"))))
-    for path, tracker in load_all_trackers():
-        url = tracker.get("url")
-        target = tracker.get("target_price")
-        email = tracker.get("email")
-        if not url or target is None or not email:
-            logging.warning("Skipping invalid tracker %s", path)
-            continue
+FLUSH_INTERVAL_SECONDS = 5
+_flush_stop = threading.Event()
 
+
+def _flush_loop():
+    while not _flush_stop.wait(FLUSH_INTERVAL_SECONDS):
         try:
-            current = get_price(url)
+            flush_trackers()
         except Exception:
-            logging.exception("Price fetch failed for %s", url)
-            continue
+            logging.exception("Tracker flush failed")
 
-        if current is None:
-            logging.info("Price not found for %s (tracker %s)", url, path.name)
-            continue
 
-        logging.info("Tracker %s: current=%.2f target=%.2f", path.name, current, float(target))
+def _stop_flusher():
+    _flush_stop.set()
+    flush_trackers()
+
+
+_load_trackers()
+# Every process that accepts /track flushes on its own timer, independent of the price-check scheduler.
+threading.Thread(target=_flush_loop, name="tracker-flush", daemon=True).start()
+atexit.register(_stop_flusher)
+
 
+executor = ThreadPoolExecutor(max_workers=TRACKER_PARALLELISM, thread_name_prefix="tracker")
+
+
+def check_all_trackers():
+    refresh_trackers()
+    trackers = list(load_all_trackers())
+    logging.info("Running scheduled check for %s trackers", len(trackers))
+    futures = [executor.submit(_process_tracker, tid, tracker) for tid, tracker in trackers]
+    processed = 0
+    for future in as_completed(futures):
         try:
-            if float(current) <= float(target):
-                ok = send_email(email, url, current, target)
-                if ok:
-                    logging.info("Email sent for tracker %s, deleting file.", path.name)
-                    delete_tracker_file(path)
-                else:
-                    logging.warning("Failed to send email for tracker %s; will retry later.", path.name)
+            if future.result():
+                processed += 1
         except Exception:
-            logging.exception("Error handling tracker %s", path.name)
+            logging.exception("Tracker check crashed")
+    logging.info("Processed %d of %d trackers", processed, len(trackers))
+    # Keep one warm Chrome for the next run instead of a full pool idling between runs.
+    _trim_idle_drivers(keep=1)
+
+
+def _process_tracker(tid, tracker):
+    """Check one tracker's price and send the alert if due. Returns True if a price was compared."""
+    url = tracker.get("url")
+    target = tracker.get("target_price")
+    email = tracker.get("email")
+    if not url or target is None or not email:
+        logging.warning("Skipping invalid tracker %s", tid)
+        return
+
+    try:
+        current = get_price(url)
+    except Exception:
+        logging.exception("Price fetch failed for %s", url)
+        return
+
+    if current is None:
+        logging.info("Price not found for %s (tracker %s)", url, tid)
+        return
+
+    logging.info("Tracker %s: current=%.2f target=%.2f", tid, current, float(target))
+
+    try:
+        if float(current) <= float(target):
+            ok = send_email(email, url, current, target)
+            if ok:
+                logging.info("Email sent for tracker %s, deleting it.", tid)
+                delete_tracker(tid)
+            else:
+                logging.warning("Failed to send email for tracker %s; will retry later.", tid)
+    except Exception:
+        logging.exception("Error handling tracker %s", tid)
+    return True
 
 
 app = Flask(__name__, template_folder=str(Path(__file__).parent / "templates"))
@@ -195,6 +586,8 @@ def index():
 @app.route("/track", methods=["POST"])
 def track():
     data = request.get_json() or request.form.to_dict()
+    if not isinstance(data, dict):
+        return jsonify({"ok": False, "error": "Request body must be a JSON object"}), 400
     url = data.get("url")
     target = data.get("target_price") or data.get("target")
     email = data.get("email")
@@ -202,42 +595,35 @@ def track():
     if not url or not target or not email:
         return jsonify({"ok": False, "error": "Missing url, target_price or email"}), 400
 
+    if not isinstance(url, str) or not isinstance(email, str):
+        return jsonify({"ok": False, "error": "url and email must be strings"}), 400
+
     try:
         target_price = float(target)
-    except ValueError:
+    except (TypeError, ValueError):
         return jsonify({"ok": False, "error": "target_price must be numeric"}), 400
+    if not math.isfinite(target_price):
+        return jsonify({"ok": False, "error": "target_price must be a finite number"}), 400
 
     tracker = {"url": url, "target_price": target_price, "email": email, "created_at": time.time()}
     tid = save_tracker(tracker)
-    try:
-        current = get_price(url)
-    except Exception:
-        current = None
-
-    emailed = False
-    if current is not None:
-        try:
-            if float(current) <= float(target_price):
-                ok = send_email(email, url, current, target_price)
-                if ok:
-                    delete_tracker_file(Path(DATA_DIR / f"{tid}.json"))
-                    emailed = True
-        except Exception:
-            logging.exception("Immediate check failed for tracker %s", tid)
+    # The first price check can take seconds; run it in the background like a scheduled one.
+    executor.submit(_process_tracker, tid, tracker)
 
-    return jsonify({"ok": True, "id": tid, "emailed": emailed, "current_price": current})
+    return jsonify({"ok": True, "id": tid, "status": "pending"}), 202
 
 
 @app.route("/status", methods=["GET"])
 def status():
-    items = []
-    for p, d in load_all_trackers():
-        items.append({"id": p.stem, "url": d.get("url"), "target_price": d.get("target_price"), "email": d.get("email")})
-    return jsonify({"ok": True, "trackers": items})
+    items = [
+        {"id": tid, "url": d.get("url"), "target_price": d.get("target_price"), "email": d.get("email")}
+        for tid, d in load_all_trackers()
+    ]
+    return app.response_class(orjson.dumps({"ok": True, "trackers": items}), mimetype="application/json")
 
 
-if __name__ == "__main__":
-    logging.basicConfig(level=logging.INFO)
+def start_scheduler():
+    """Start the periodic price check."""
     scheduler = BackgroundScheduler()
     try:
         interval_min = int(os.getenv("CHECK_INTERVAL_MINUTES", "15"))
@@ -245,10 +631,59 @@ if __name__ == "__main__":
         interval_min = 15
 
     # APScheduler expects a datetime for `next_run_time`, not a float timestamp.
-    scheduler.add_job(check_all_trackers, "interval", minutes=interval_min, next_run_time=datetime.datetime.now())
+    # A slow pass must not overlap the next one; missed runs collapse into a single run.
+    scheduler.add_job(
+        check_all_trackers,
+        "interval",
+        minutes=interval_min,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60,
+        next_run_time=datetime.datetime.now(),
+    )
     scheduler.start()
+    return scheduler
+
+
+_scheduler_lock_file = None
+
+
+def _claim_scheduler() -> bool:
+    """Take an exclusive lock on DATA_DIR/scheduler.lock; only the process holding it runs price checks."""
+    global _scheduler_lock_file
+    try:
+        import fcntl  # POSIX only, like gunicorn itself
+    except ImportError:
+        return True
+    f = open(DATA_DIR / "scheduler.lock", "w")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return False
+    _scheduler_lock_file = f
+    return True
+
+
+# Under gunicorn (see Procfile) SCHEDULER_PROCESS=1 is set for every worker; the first to claim the lock runs the checks.
+_scheduler = None
+if os.environ.get("SCHEDULER_PROCESS") == "1":
+    logging.basicConfig(level=logging.INFO)
+    if _claim_scheduler():
+        _scheduler = start_scheduler()
+        if __name__ != "__main__":
+            # Run directly, the __main__ block below shuts the scheduler down itself.
+            atexit.register(_scheduler.shutdown, wait=False)
+    else:
+        logging.info("Another process runs the price checks; this one only serves requests.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    scheduler = _scheduler if os.environ.get("SCHEDULER_PROCESS") == "1" else start_scheduler()
 
     try:
         app.run(host="0.0.0.0", port=5000)
     finally:
-        scheduler.shutdown()
+        if scheduler is not None:
+            scheduler.shutdown()